@@ -2,14 +2,18 @@
 """
 Main script to sync newsletters from email to reMarkable tablet.
 """
+import argparse
 import os
+import re
 import sys
+import time
 import yaml
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from dotenv import load_dotenv
 from src.email_fetcher import EmailFetcher
-from src.pdf_converter import PDFConverter
+from src import pdf_converter
 from src.remarkable_client import RemarkableClient
 from src.document_tracker import DocumentTracker
 from src.cleanup import NewsletterCleanup
@@ -25,11 +29,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Characters not allowed in reMarkable document filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9 _-]')
+
 
 def load_config(config_path: str = 'config.yaml') -> dict:
     """Load configuration from YAML file."""
     if not Path(config_path).exists():
-        logger.error(f"Configuration file not found: {config_path}")
+        logger.error("Configuration file not found: %s", config_path)
         logger.error("Please copy config.yaml.example to config.yaml and fill in your settings")
         sys.exit(1)
 
@@ -41,45 +48,61 @@ def get_env_variable(var_name: str) -> str:
     """Get environment variable with error handling."""
     value = os.getenv(var_name)
     if not value:
-        logger.error(f"Environment variable {var_name} not set")
+        logger.error("Environment variable %s not set", var_name)
         logger.error("Please check your .env file")
         sys.exit(1)
     return value
 
 
-def fetch_newsletters(config: dict) -> list:
-    """Fetch newsletters from all configured email accounts."""
-    all_newsletters = []
+def _fetch_one_account(account: dict, config: dict, tracker: DocumentTracker) -> list:
+    """Fetch newsletters from a single email account."""
+    logger.info("Fetching newsletters from %s", account['email'])
 
-    for account in config['email_accounts']:
-        logger.info(f"Fetching newsletters from {account['email']}")
+    try:
+        # Get password from environment
+        password = get_env_variable(account['password_env'])
+
+        # Create fetcher and connect
+        fetcher = EmailFetcher(
+            email_address=account['email'],
+            password=password,
+            imap_server=account['imap_server'],
+            imap_port=account.get('imap_port', 993)
+        )
 
-        try:
-            # Get password from environment
-            password = get_env_variable(account['password_env'])
-
-            # Create fetcher and connect
-            fetcher = EmailFetcher(
-                email_address=account['email'],
-                password=password,
-                imap_server=account['imap_server'],
-                imap_port=account.get('imap_port', 993)
+        with fetcher:
+            newsletters = fetcher.fetch_newsletters(
+                folder=account.get('folder', 'INBOX'),
+                lookback_days=config['sync'].get('lookback_days', 7),
+                allowed_senders=account.get('allowed_senders'),
+                mark_as_read=config['sync'].get('mark_as_read', False),
+                fetch_batch_size=config['sync'].get('fetch_batch_size', 100),
+                already_uploaded=tracker.is_already_uploaded
             )
 
-            with fetcher:
-                newsletters = fetcher.fetch_newsletters(
-                    folder=account.get('folder', 'INBOX'),
-                    lookback_days=config['sync'].get('lookback_days', 7),
-                    allowed_senders=account.get('allowed_senders'),
-                    mark_as_read=config['sync'].get('mark_as_read', False)
-                )
+            logger.info("Fetched %s newsletters from %s", len(newsletters), account['email'])
+            return newsletters
 
-                all_newsletters.extend(newsletters)
-                logger.info(f"Fetched {len(newsletters)} newsletters from {account['email']}")
+    except Exception as e:
+        logger.error("Error fetching from %s: %s", account['email'], e)
+        return []
 
-        except Exception as e:
-            logger.error(f"Error fetching from {account['email']}: {e}")
-            continue
+
+def fetch_newsletters(config: dict, tracker: DocumentTracker) -> list:
+    """Fetch newsletters from all configured email accounts in parallel."""
+    accounts = config['email_accounts']
+    all_newsletters = []
+
+    # Accounts are independent connections, so fetch them concurrently:
+    # wall-clock drops from the sum of per-account times to the slowest one.
+    # Threads are the right primitive here since imaplib is blocking I/O.
+    with ThreadPoolExecutor(max_workers=max(len(accounts), 1)) as executor:
+        futures = [
+            executor.submit(_fetch_one_account, account, config, tracker)
+            for account in accounts
+        ]
+        for future in as_completed(futures):
+            all_newsletters.extend(future.result())
 
     return all_newsletters
 
@@ -94,82 +117,87 @@ def upload_newsletters(newsletters: list, config: dict, remarkable: RemarkableCl
     folder_name = config['remarkable']['folder_name']
     folder = remarkable.get_or_create_folder(folder_name)
 
-    # Initialize PDF converter
-    pdf_converter = PDFConverter()
+    # Skip already-uploaded newsletters before rendering any PDFs
+    pending = []
+    for newsletter in newsletters:
+        if newsletter.message_id and tracker.is_already_uploaded(newsletter.message_id):
+            logger.info("Skipping already uploaded: %s", newsletter.subject)
+            continue
+        pending.append(newsletter)
 
-    uploaded_count = 0
+    if not pending:
+        logger.info("No new newsletters to upload")
+        return 0
 
-    for newsletter in newsletters:
-        try:
-            # Skip if already uploaded
-            if newsletter.message_id and tracker.is_already_uploaded(newsletter.message_id):
-                logger.info(f"Skipping already uploaded: {newsletter.subject}")
-                continue
+    uploaded_count = 0
 
-            # Convert to PDF
-            pdf_bytes = pdf_converter.convert_newsletter_to_pdf(
+    # PDF rendering (HTML parse, layout, font shaping) is CPU-bound, while
+    # uploads are network-bound. Render in worker processes across cores and
+    # upload each PDF on the main thread as soon as it is ready.
+    with ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        initializer=pdf_converter.init_worker
+    ) as executor:
+        futures = {
+            executor.submit(
+                pdf_converter.convert_job,
                 subject=newsletter.subject,
                 sender=newsletter.sender,
                 date=newsletter.date,
                 html_body=newsletter.html_body,
                 text_body=newsletter.text_body
-            )
-
-            # Generate filename
-            safe_subject = "".join(
-                c if c.isalnum() or c in (' ', '-', '_') else '_'
-                for c in newsletter.subject
-            )
-            filename = f"{safe_subject[:50]}"
-
-            # Upload to reMarkable
-            doc = remarkable.upload_pdf(pdf_bytes, filename, folder)
-
-            # Track the upload
-            tracker.add_document(
-                document_id=doc.ID,
-                title=filename,
-                message_id=newsletter.message_id
-            )
+            ): newsletter
+            for newsletter in pending
+        }
+
+        for future in as_completed(futures):
+            newsletter = futures[future]
+            try:
+                pdf_bytes = future.result()
+
+                # Generate filename
+                filename = _UNSAFE_FILENAME_CHARS.sub('_', newsletter.subject)[:50]
+
+                # Upload to reMarkable
+                doc = remarkable.upload_pdf(pdf_bytes, filename, folder)
+
+                # Track the upload
+                tracker.add_document(
+                    document_id=doc.ID,
+                    title=filename,
+                    message_id=newsletter.message_id
+                )
 
-            uploaded_count += 1
-            logger.info(f"Uploaded: {filename}")
+                uploaded_count += 1
+                logger.info("Uploaded: %s", filename)
 
-        except Exception as e:
-            logger.error(f"Error uploading newsletter '{newsletter.subject}': {e}")
-            continue
+            except Exception as e:
+                logger.error("Error uploading newsletter '%s': %s", newsletter.subject, e)
+                continue
 
     return uploaded_count
 
 
-def main():
-    """Main execution function."""
+def run_sync(config: dict) -> None:
+    """Run one full fetch/upload/cleanup cycle."""
     logger.info("=== Newsletter to reMarkable Sync Started ===")
 
-    # Load environment variables
-    load_dotenv()
-
-    # Load configuration
-    config = load_config()
-
-    # Initialize document tracker
-    tracker = DocumentTracker()
-
     # Initialize reMarkable client
     remarkable_token = get_env_variable(config['remarkable']['one_time_code_env'])
     remarkable = RemarkableClient(remarkable_token)
 
-    try:
+    # The tracker batches its saves; flushed once when the block exits
+    with DocumentTracker() as tracker:
         # Authenticate with reMarkable
         remarkable.authenticate()
 
         # Fetch newsletters from email
-        newsletters = fetch_newsletters(config)
-        logger.info(f"Total newsletters fetched: {len(newsletters)}")
+        newsletters = fetch_newsletters(config, tracker)
+        logger.info("Total newsletters fetched: %s", len(newsletters))
 
         # Upload newsletters to reMarkable
         uploaded_count = upload_newsletters(newsletters, config, remarkable, tracker)
-        logger.info(f"Successfully uploaded {uploaded_count} newsletters")
+        logger.info("Successfully uploaded %s newsletters", uploaded_count)
 
         # Cleanup old newsletters
         cleanup = NewsletterCleanup(remarkable, tracker)
@@ -177,16 +205,52 @@ def main():
             folder_name=config['remarkable']['folder_name'],
             max_age_days=config['cleanup']['max_age_days']
         )
-        logger.info(f"Cleaned up {deleted_count} old newsletters")
+        logger.info("Cleaned up %s old newsletters", deleted_count)
 
         # Sync tracker with reMarkable
         cleanup.sync_tracker(config['remarkable']['folder_name'])
 
-        logger.info("=== Newsletter to reMarkable Sync Completed Successfully ===")
+    logger.info("=== Newsletter to reMarkable Sync Completed Successfully ===")
 
-    except Exception as e:
-        logger.error(f"Fatal error during sync: {e}", exc_info=True)
-        sys.exit(1)
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Sync newsletters from email to reMarkable")
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help="Keep running, syncing every sync.poll_interval_minutes "
+             "instead of exiting after one cycle"
+    )
+    args = parser.parse_args()
+
+    # Load environment variables
+    load_dotenv()
+
+    # Load configuration
+    config = load_config()
+
+    if not args.daemon:
+        try:
+            run_sync(config)
+        except Exception as e:
+            logger.error("Fatal error during sync: %s", e, exc_info=True)
+            sys.exit(1)
+        return
+
+    # Daemon mode: loop forever so repeated cycles reuse the warm process
+    # (imports, font caches) instead of paying startup cost per cron run
+    interval = config['sync'].get('poll_interval_minutes', 30) * 60
+    logger.info("Running in daemon mode, syncing every %s minutes", interval // 60)
+
+    while True:
+        try:
+            run_sync(config)
+        except Exception as e:
+            # In daemon mode a failed cycle should not kill the process
+            logger.error("Sync cycle failed: %s", e, exc_info=True)
+
+        time.sleep(interval)
 
 
 if __name__ == "__main__":
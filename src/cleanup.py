@@ -2,7 +2,7 @@
 Cleanup old newsletters from reMarkable based on age.
 """
 import logging
-from typing import List
+from typing import Dict, List
 from .remarkable_client import RemarkableClient
 from .document_tracker import DocumentTracker
 
@@ -22,6 +22,15 @@ class NewsletterCleanup:
         """
         self.remarkable = remarkable_client
         self.tracker = tracker
+        # Folder listings fetched during this cleanup run, keyed by folder
+        # name, so cleanup and the tracker sync share one network round-trip
+        self._folder_cache: Dict[str, List] = {}
+
+    def _get_folder_docs(self, folder_name: str) -> List:
+        """Get the documents in a folder, fetching from the cloud only once."""
+        if folder_name not in self._folder_cache:
+            self._folder_cache[folder_name] = self.remarkable.get_documents_in_folder(folder_name)
+        return self._folder_cache[folder_name]
 
     def cleanup_old_newsletters(
         self,
@@ -38,7 +47,7 @@ class NewsletterCleanup:
         Returns:
             Number of documents deleted
         """
-        logger.info(f"Starting cleanup: deleting newsletters older than {max_age_days} days")
+        logger.info("Starting cleanup: deleting newsletters older than %s days", max_age_days)
 
         # Get old documents from tracker
         old_documents = self.tracker.get_old_documents(max_age_days)
@@ -48,7 +57,7 @@ class NewsletterCleanup:
             return 0
 
         # Get current documents from reMarkable
-        remarkable_docs = self.remarkable.get_documents_in_folder(folder_name)
+        remarkable_docs = self._get_folder_docs(folder_name)
         remarkable_doc_map = {doc.ID: doc for doc in remarkable_docs}
 
         deleted_count = 0
@@ -64,21 +73,21 @@ class NewsletterCleanup:
 
                     deleted_count += 1
                     logger.info(
-                        f"Deleted: {metadata['title']} "
-                        f"(age: {metadata['age_days']} days)"
+                        "Deleted: %s (age: %s days)",
+                        metadata['title'], metadata['age_days']
                     )
 
                 except Exception as e:
-                    logger.error(f"Error deleting document {doc_id}: {e}")
+                    logger.error("Error deleting document %s: %s", doc_id, e)
             else:
                 # Document no longer exists on reMarkable, just remove from tracker
                 logger.info(
-                    f"Document {metadata['title']} not found on reMarkable, "
-                    f"removing from tracker"
+                    "Document %s not found on reMarkable, removing from tracker",
+                    metadata['title']
                 )
                 self.tracker.remove_document(doc_id)
 
-        logger.info(f"Cleanup complete: deleted {deleted_count} documents")
+        logger.info("Cleanup complete: deleted %s documents", deleted_count)
         return deleted_count
 
     def sync_tracker(self, folder_name: str) -> None:
@@ -90,7 +99,7 @@ class NewsletterCleanup:
         """
         logger.info("Syncing tracker with reMarkable")
 
-        remarkable_docs = self.remarkable.get_documents_in_folder(folder_name)
+        remarkable_docs = self._get_folder_docs(folder_name)
         remarkable_doc_ids = [doc.ID for doc in remarkable_docs]
 
         self.tracker.sync_with_remarkable(remarkable_doc_ids)
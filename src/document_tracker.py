@@ -1,9 +1,11 @@
 """
 Track uploaded documents and their upload dates for cleanup purposes.
 """
-import json
-from datetime import datetime
-from typing import Dict, Optional
+import orjson
+import os
+from bisect import insort
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import logging
 
@@ -22,30 +24,56 @@ class DocumentTracker:
         """
         self.tracker_file = Path(tracker_file)
         self.documents: Dict[str, Dict] = {}
+        # Reverse index: message_id -> document_id, for O(1) dedupe lookups
+        self._by_message_id: Dict[str, str] = {}
+        # Upload dates parsed once and kept sorted, so age scans touch only
+        # the documents that are actually old instead of the whole tracker
+        self._by_date: List[Tuple[datetime, str]] = []
+        self.dirty = False
         self._load()
 
     def _load(self) -> None:
         """Load tracker data from file."""
         if self.tracker_file.exists():
             try:
-                with open(self.tracker_file, 'r') as f:
-                    self.documents = json.load(f)
-                logger.info(f"Loaded {len(self.documents)} tracked documents")
+                self.documents = orjson.loads(self.tracker_file.read_bytes())
+                logger.info("Loaded %s tracked documents", len(self.documents))
             except Exception as e:
-                logger.error(f"Error loading tracker file: {e}")
+                logger.error("Error loading tracker file: %s", e)
                 self.documents = {}
         else:
             logger.info("No existing tracker file found, starting fresh")
             self.documents = {}
 
+        self._by_message_id = {
+            metadata['message_id']: doc_id
+            for doc_id, metadata in self.documents.items()
+            if metadata.get('message_id')
+        }
+        self._by_date = sorted(
+            (datetime.fromisoformat(metadata['upload_date']), doc_id)
+            for doc_id, metadata in self.documents.items()
+        )
+
     def _save(self) -> None:
-        """Save tracker data to file."""
+        """Mark tracker data as needing a save (written on flush)."""
+        self.dirty = True
+
+    def flush(self) -> None:
+        """Write tracker data to file if anything changed since the last save."""
+        if not self.dirty:
+            return
+
         try:
-            with open(self.tracker_file, 'w') as f:
-                json.dump(self.documents, f, indent=2)
-            logger.debug(f"Saved {len(self.documents)} tracked documents")
+            # Write to a temp file then replace atomically, so a crash
+            # mid-write cannot corrupt the tracker
+            tmp_file = self.tracker_file.with_suffix('.json.tmp')
+            tmp_file.write_bytes(orjson.dumps(self.documents, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, self.tracker_file)
+            self.dirty = False
+            logger.debug("Saved %s tracked documents", len(self.documents))
         except Exception as e:
-            logger.error(f"Error saving tracker file: {e}")
+            logger.error("Error saving tracker file: %s", e)
 
     def add_document(
         self,
@@ -66,14 +94,33 @@ class DocumentTracker:
         if upload_date is None:
             upload_date = datetime.now()
 
+        # Drop any stale index entries if this document is being updated
+        old_metadata = self.documents.get(document_id)
+        if old_metadata:
+            if old_metadata.get('message_id'):
+                self._by_message_id.pop(old_metadata['message_id'], None)
+            self._drop_from_date_index(document_id, old_metadata)
+
         self.documents[document_id] = {
             'title': title,
             'upload_date': upload_date.isoformat(),
             'message_id': message_id
         }
+        if message_id:
+            self._by_message_id[message_id] = document_id
+        insort(self._by_date, (upload_date, document_id))
 
         self._save()
-        logger.info(f"Tracked document: {title} (ID: {document_id})")
+        logger.info("Tracked document: %s (ID: %s)", title, document_id)
+
+    def _drop_from_date_index(self, document_id: str, metadata: Dict) -> None:
+        """Remove a document's entry from the sorted date index."""
+        try:
+            self._by_date.remove(
+                (datetime.fromisoformat(metadata['upload_date']), document_id)
+            )
+        except ValueError:
+            pass
 
     def get_document(self, document_id: str) -> Optional[Dict]:
         """
@@ -95,10 +142,14 @@ class DocumentTracker:
             document_id: Document ID to remove
         """
         if document_id in self.documents:
-            title = self.documents[document_id]['title']
+            metadata = self.documents[document_id]
+            title = metadata['title']
+            if metadata.get('message_id'):
+                self._by_message_id.pop(metadata['message_id'], None)
+            self._drop_from_date_index(document_id, metadata)
             del self.documents[document_id]
             self._save()
-            logger.info(f"Removed from tracker: {title} (ID: {document_id})")
+            logger.info("Removed from tracker: %s (ID: %s)", title, document_id)
 
     def get_old_documents(self, max_age_days: int) -> Dict[str, Dict]:
         """
@@ -111,19 +162,19 @@ class DocumentTracker:
             Dict of document_id -> metadata for old documents
         """
         now = datetime.now()
+        cutoff = now - timedelta(days=max_age_days)
         old_documents = {}
 
-        for doc_id, metadata in self.documents.items():
-            upload_date = datetime.fromisoformat(metadata['upload_date'])
-            age_days = (now - upload_date).days
-
-            if age_days >= max_age_days:
-                old_documents[doc_id] = {
-                    **metadata,
-                    'age_days': age_days
-                }
+        # _by_date is sorted, so the old documents are a prefix of the list
+        for upload_date, doc_id in self._by_date:
+            if upload_date > cutoff:
+                break
+            old_documents[doc_id] = {
+                **self.documents[doc_id],
+                'age_days': (now - upload_date).days
+            }
 
-        logger.info(f"Found {len(old_documents)} documents older than {max_age_days} days")
+        logger.info("Found %s documents older than %s days", len(old_documents), max_age_days)
         return old_documents
 
     def is_already_uploaded(self, message_id: str) -> bool:
@@ -136,10 +187,7 @@ class DocumentTracker:
         Returns:
             True if already uploaded
         """
-        for metadata in self.documents.values():
-            if metadata.get('message_id') == message_id:
-                return True
-        return False
+        return message_id in self._by_message_id
 
     def get_all_documents(self) -> Dict[str, Dict]:
         """
@@ -160,10 +208,21 @@ class DocumentTracker:
         removed_count = 0
         for doc_id in list(self.documents.keys()):
             if doc_id not in remarkable_document_ids:
-                logger.info(f"Document {doc_id} no longer on reMarkable, removing from tracker")
-                del self.documents[doc_id]
+                logger.info("Document %s no longer on reMarkable, removing from tracker", doc_id)
+                metadata = self.documents.pop(doc_id)
+                if metadata.get('message_id'):
+                    self._by_message_id.pop(metadata['message_id'], None)
+                self._drop_from_date_index(doc_id, metadata)
                 removed_count += 1
 
         if removed_count > 0:
             self._save()
-            logger.info(f"Synced tracker, removed {removed_count} documents")
+            logger.info("Synced tracker, removed %s documents", removed_count)
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit: flush any pending changes."""
+        self.flush()
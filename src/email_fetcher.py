@@ -3,13 +3,21 @@ Fetch newsletters from email accounts (Gmail, iCloud) via IMAP.
 """
 import imaplib
 import email
+import re
+from email import policy
 from email.header import decode_header
+from email.parser import BytesParser
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Modern-policy parser: faster than the legacy compat32 default, decodes
+# RFC 2047 headers up front, and can pick the preferred body part directly
+_PARSER = BytesParser(policy=policy.default)
+
 
 class Newsletter:
     """Represents a newsletter email."""
@@ -29,19 +37,23 @@ class Newsletter:
 class EmailFetcher:
     """Fetch newsletters from email accounts via IMAP."""
 
+    # Headers fetched in the cheap first pass; PEEK avoids setting \Seen
+    HEADER_FIELDS = "(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE MESSAGE-ID)])"
+
     def __init__(self, email_address: str, password: str, imap_server: str, imap_port: int = 993):
         self.email_address = email_address
         self.password = password
         self.imap_server = imap_server
         self.imap_port = imap_port
         self.connection: Optional[imaplib.IMAP4_SSL] = None
+        self._sender_re: Optional[re.Pattern] = None
 
     def connect(self) -> None:
         """Connect to the IMAP server."""
-        logger.info(f"Connecting to {self.imap_server}:{self.imap_port}")
+        logger.info("Connecting to %s:%s", self.imap_server, self.imap_port)
         self.connection = imaplib.IMAP4_SSL(self.imap_server, self.imap_port)
         self.connection.login(self.email_address, self.password)
-        logger.info(f"Successfully logged in as {self.email_address}")
+        logger.info("Successfully logged in as %s", self.email_address)
 
     def disconnect(self) -> None:
         """Disconnect from the IMAP server."""
@@ -54,7 +66,9 @@ class EmailFetcher:
         folder: str = "INBOX",
         lookback_days: int = 7,
         allowed_senders: Optional[List[str]] = None,
-        mark_as_read: bool = False
+        mark_as_read: bool = False,
+        fetch_batch_size: int = 100,
+        already_uploaded: Optional[Callable[[str], bool]] = None
     ) -> List[Newsletter]:
         """
         Fetch newsletters from the specified folder.
@@ -64,6 +78,9 @@ class EmailFetcher:
             lookback_days: How many days back to search for emails
             allowed_senders: List of email addresses to filter by (None = all senders)
             mark_as_read: Whether to mark emails as read after fetching
+            fetch_batch_size: Number of messages to download per IMAP FETCH round-trip
+            already_uploaded: Optional predicate on Message-ID; matching emails
+                are dropped before their bodies are downloaded
 
         Returns:
             List of Newsletter objects
@@ -71,106 +88,220 @@ class EmailFetcher:
         if not self.connection:
             raise RuntimeError("Not connected to IMAP server. Call connect() first.")
 
+        # Compile the sender filter once per fetch: one C-level scan per
+        # message regardless of how many senders are configured, and
+        # matching is case-insensitive
+        if allowed_senders:
+            self._sender_re = re.compile(
+                '|'.join(re.escape(sender.lower()) for sender in allowed_senders)
+            )
+        else:
+            self._sender_re = None
+
         newsletters = []
 
         # Select the mailbox
-        logger.info(f"Selecting folder: {folder}")
+        logger.info("Selecting folder: %s", folder)
         status, messages = self.connection.select(folder)
         if status != "OK":
-            logger.error(f"Failed to select folder {folder}")
+            logger.error("Failed to select folder %s", folder)
             return newsletters
 
         # Calculate date threshold
         date_threshold = datetime.now() - timedelta(days=lookback_days)
         date_str = date_threshold.strftime("%d-%b-%Y")
 
-        # Search for emails since the date threshold
-        search_criteria = f'SINCE {date_str}'
-        logger.info(f"Searching for emails with criteria: {search_criteria}")
+        # Search for emails since the date threshold, filtering by sender on
+        # the server so irrelevant mail is never downloaded. UID commands keep
+        # message IDs stable even if the mailbox changes under us.
+        search_criteria = self._build_search_criteria(date_str, allowed_senders)
+        logger.info("Searching for emails with criteria: %s", search_criteria)
 
-        status, email_ids = self.connection.search(None, search_criteria)
+        status, email_ids = self.connection.uid('SEARCH', None, search_criteria)
         if status != "OK":
             logger.error("Failed to search emails")
             return newsletters
 
         email_id_list = email_ids[0].split()
-        logger.info(f"Found {len(email_id_list)} emails")
+        logger.info("Found %s emails", len(email_id_list))
 
-        for email_id in email_id_list:
-            try:
-                newsletter = self._fetch_email(email_id, allowed_senders)
-                if newsletter:
-                    newsletters.append(newsletter)
+        # Phase 1: fetch only headers (cheap) and drop messages whose full
+        # body we will never need — the common case on steady-state syncs
+        email_id_list = self._filter_by_headers(
+            email_id_list, already_uploaded, fetch_batch_size
+        )
+        logger.info("%s emails remaining after header filtering", len(email_id_list))
 
-                    if mark_as_read:
-                        self.connection.store(email_id, '+FLAGS', '\\Seen')
+        # Phase 2: download the surviving bodies in batches, one FETCH
+        # round-trip per batch instead of one per message
+        for start in range(0, len(email_id_list), fetch_batch_size):
+            batch = email_id_list[start:start + fetch_batch_size]
+            id_set = b','.join(batch)
 
+            try:
+                status, msg_data = self.connection.uid('FETCH', id_set, "(BODY.PEEK[])")
             except Exception as e:
-                logger.error(f"Error fetching email {email_id}: {e}")
+                logger.error("Error fetching batch starting at %s: %s", batch[0], e)
+                continue
+
+            if status != "OK":
+                logger.error("Failed to fetch batch starting at %s", batch[0])
                 continue
 
-        logger.info(f"Successfully fetched {len(newsletters)} newsletters")
+            matched_ids = []
+            # The response alternates (b'id (RFC822 {size}', b'<raw>') tuples
+            # with b')' separators; only the tuples carry message bodies
+            for item in msg_data:
+                if not isinstance(item, tuple):
+                    continue
+
+                uid_match = re.search(rb'UID (\d+)', item[0])
+                email_uid = uid_match.group(1) if uid_match else item[0].split()[0]
+                try:
+                    newsletter = self._parse_message(item[1])
+                    if newsletter:
+                        newsletters.append(newsletter)
+                        matched_ids.append(email_uid)
+
+                except Exception as e:
+                    logger.error("Error parsing email %s: %s", email_uid, e)
+                    continue
+
+            if mark_as_read and matched_ids:
+                # Single STORE per batch instead of one per message
+                self.connection.uid('STORE', b','.join(matched_ids), '+FLAGS', '\\Seen')
+
+        logger.info("Successfully fetched %s newsletters", len(newsletters))
         return newsletters
 
-    def _fetch_email(self, email_id: bytes, allowed_senders: Optional[List[str]]) -> Optional[Newsletter]:
-        """Fetch and parse a single email."""
-        status, msg_data = self.connection.fetch(email_id, "(RFC822)")
+    def _filter_by_headers(
+        self,
+        email_id_list: List[bytes],
+        already_uploaded: Optional[Callable[[str], bool]],
+        fetch_batch_size: int
+    ) -> List[bytes]:
+        """Cheap header-only pass returning the UIDs whose bodies we want."""
+        wanted = []
 
-        if status != "OK":
-            return None
+        for start in range(0, len(email_id_list), fetch_batch_size):
+            batch = email_id_list[start:start + fetch_batch_size]
+            id_set = b','.join(batch)
 
-        # Parse the email
-        email_body = msg_data[0][1]
-        msg = email.message_from_bytes(email_body)
+            try:
+                status, msg_data = self.connection.uid('FETCH', id_set, self.HEADER_FIELDS)
+            except Exception as e:
+                logger.error("Error fetching headers for batch starting at %s: %s", batch[0], e)
+                # Keep the batch; the body-phase filters still apply
+                wanted.extend(batch)
+                continue
+
+            if status != "OK":
+                wanted.extend(batch)
+                continue
+
+            for item in msg_data:
+                if not isinstance(item, tuple):
+                    continue
+
+                uid_match = re.search(rb'UID (\d+)', item[0])
+                if not uid_match:
+                    continue
+                email_uid = uid_match.group(1)
+
+                headers = _PARSER.parsebytes(item[1], headersonly=True)
+
+                if self._sender_re:
+                    sender_email = email.utils.parseaddr(str(headers.get("From", "")))[1]
+                    if not self._sender_re.search(sender_email.lower()):
+                        continue
+
+                message_id = str(headers.get("Message-ID", ""))
+                if already_uploaded and message_id and already_uploaded(message_id):
+                    logger.debug("Skipping already uploaded message %s", message_id)
+                    continue
+
+                wanted.append(email_uid)
+
+        return wanted
+
+    @staticmethod
+    def _build_search_criteria(date_str: str, allowed_senders: Optional[List[str]]) -> str:
+        """Build an IMAP search string, pushing the sender filter to the server."""
+        criteria = f'(SINCE {date_str})'
 
-        # Extract sender
-        sender = msg.get("From", "")
-        # Filter by allowed senders if specified
         if allowed_senders:
+            # IMAP OR is binary, so multiple senders nest:
+            # (OR FROM "a" (OR FROM "b" FROM "c"))
+            sender_clause = f'FROM "{allowed_senders[-1]}"'
+            for sender in reversed(allowed_senders[:-1]):
+                sender_clause = f'(OR FROM "{sender}" {sender_clause})'
+            criteria = f'{criteria} {sender_clause}'
+
+        return criteria
+
+    def _parse_message(self, email_body: bytes) -> Optional[Newsletter]:
+        """Parse a raw RFC822 message into a Newsletter."""
+        msg = _PARSER.parsebytes(email_body)
+
+        # Extract sender
+        sender = str(msg.get("From", ""))
+        # Filter by allowed senders if specified (belt-and-braces; the
+        # server-side search and header pass already filter)
+        if self._sender_re:
             sender_email = email.utils.parseaddr(sender)[1]
-            if not any(allowed in sender_email for allowed in allowed_senders):
-                logger.debug(f"Skipping email from {sender_email} (not in allowed senders)")
+            if not self._sender_re.search(sender_email.lower()):
+                logger.debug("Skipping email from %s (not in allowed senders)", sender_email)
                 return None
 
-        # Extract subject
-        subject_header = msg.get("Subject", "")
-        subject = self._decode_header(subject_header)
+        # Extract subject; policy.default decodes RFC 2047 already, the
+        # explicit decode stays as a fallback for malformed headers
+        subject = self._decode_header(str(msg.get("Subject", "")))
 
         # Extract date
         date_str = msg.get("Date", "")
         date = email.utils.parsedate_to_datetime(date_str) if date_str else datetime.now()
 
         # Extract message ID
-        message_id = msg.get("Message-ID", "")
+        message_id = str(msg.get("Message-ID", ""))
 
-        # Extract body
+        # Extract body: get_body resolves the preferred MIME part, skipping
+        # attachments and handling charsets, without walking every part
         html_body = ""
         text_body = ""
 
-        if msg.is_multipart():
-            for part in msg.walk():
-                content_type = part.get_content_type()
-                if content_type == "text/html":
-                    html_body = part.get_payload(decode=True).decode(errors='ignore')
-                elif content_type == "text/plain":
-                    text_body = part.get_payload(decode=True).decode(errors='ignore')
-        else:
-            content_type = msg.get_content_type()
-            body = msg.get_payload(decode=True).decode(errors='ignore')
-            if content_type == "text/html":
-                html_body = body
-            else:
-                text_body = body
+        html_part = msg.get_body(preferencelist=('html',))
+        if html_part is not None:
+            html_body = html_part.get_content()
+
+        text_part = msg.get_body(preferencelist=('plain',))
+        if text_part is not None:
+            text_body = text_part.get_content()
+
+        if not html_body and not text_body and not msg.is_multipart():
+            # Single-part message of some other text type
+            payload = msg.get_payload(decode=True)
+            if payload:
+                text_body = payload.decode(errors='ignore')
 
         newsletter = Newsletter(subject, sender, date, html_body, text_body)
         newsletter.message_id = message_id
 
-        logger.debug(f"Fetched: {newsletter}")
+        logger.debug("Fetched: %s", newsletter)
         return newsletter
 
     @staticmethod
     def _decode_header(header: str) -> str:
         """Decode email header."""
+        # Fast path: no RFC 2047 encoded-words, nothing to decode — the
+        # common case for real newsletter subjects
+        if '=?' not in header:
+            return header
+        return EmailFetcher._decode_encoded_header(header)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _decode_encoded_header(header: str) -> str:
+        """Decode an RFC 2047 encoded header (cached; subjects repeat)."""
         decoded_parts = decode_header(header)
         decoded_str = ""
         for part, encoding in decoded_parts:
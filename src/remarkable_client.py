@@ -1,15 +1,46 @@
 """
 Interface with reMarkable Cloud API to upload and manage documents.
 """
-from rmapy.api import Client
-from rmapy.folder import Folder
-from rmapy.document import Document
-from typing import Optional, List
+from __future__ import annotations
+
+import io
+import os
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, List, Tuple
 import logging
 from datetime import datetime
 
+# rmapy pulls in requests/urllib3/crypto; defer those imports to first
+# use so merely importing this module stays cheap (cold starts, tooling)
+if TYPE_CHECKING:
+    from rmapy.api import Client
+    from rmapy.document import Document
+    from rmapy.folder import Folder
+
 logger = logging.getLogger(__name__)
 
+# One Client per process: it holds a requests.Session with a TCP+TLS
+# connection pool, so repeated RemarkableClient instantiations reuse warm
+# connections instead of re-handshaking per request
+_CLIENT_SINGLETON: Optional[Client] = None
+
+# When the shared client's token was last renewed; renewing on every
+# authenticate() call would add a needless round-trip per sync cycle
+_TOKEN_TTL = 3600.0
+_token_renewed_at: Optional[float] = None
+
+
+def _get_client() -> Client:
+    global _CLIENT_SINGLETON
+    if _CLIENT_SINGLETON is None:
+        from rmapy.api import Client
+        _CLIENT_SINGLETON = Client()
+    return _CLIENT_SINGLETON
+
 
 class RemarkableClient:
     """Client for interacting with reMarkable Cloud."""
@@ -21,26 +52,88 @@ class RemarkableClient:
         Args:
             one_time_code: One-time code from https://my.remarkable.com/device/desktop/connect
         """
-        self.client = Client()
+        self.client = _get_client()
         self.one_time_code = one_time_code
         self.is_authenticated = False
+        # Cached (fetched_at, items) from get_meta_items; the full item tree
+        # is hundreds of KB over TLS, so reuse it across lookups
+        self._meta_cache: Optional[Tuple[float, list]] = None
+        self._meta_ttl = 30.0
+        # Indices over the cached tree, rebuilt on each fetch, so folder and
+        # per-folder document lookups are dict reads instead of full scans
+        self._folders_by_name: Dict[str, Folder] = {}
+        self._docs_by_parent: Dict[str, List[Document]] = {}
+        self._all_docs: List[Document] = []
+
+    def _get_meta_items_cached(self) -> list:
+        """Get the cloud item tree, reusing a recent fetch when possible."""
+        if self._meta_cache is not None:
+            fetched_at, items = self._meta_cache
+            if time.monotonic() - fetched_at < self._meta_ttl:
+                return items
+
+        items = self.client.get_meta_items()
+        self._build_indices(items)
+        self._meta_cache = (time.monotonic(), items)
+        return items
+
+    def _build_indices(self, items: list) -> None:
+        """Classify the item tree in a single pass.
+
+        One type check per item per fetch; every getter then reads from
+        these buckets instead of rescanning the tree.
+        """
+        from rmapy.document import Document
+        from rmapy.folder import Folder
+
+        folders_by_name: Dict[str, Folder] = {}
+        docs_by_parent: Dict[str, List[Document]] = defaultdict(list)
+        all_docs: List[Document] = []
+
+        for item in items:
+            # rmapy yields exactly Folder or Document instances, so an exact
+            # type check skips the MRO walk isinstance pays per item
+            item_type = type(item)
+            if item_type is Folder:
+                folders_by_name[item.VissibleName] = item
+            elif item_type is Document:
+                docs_by_parent[item.Parent].append(item)
+                all_docs.append(item)
+
+        self._folders_by_name = folders_by_name
+        self._docs_by_parent = docs_by_parent
+        self._all_docs = all_docs
+
+    def invalidate_meta_cache(self) -> None:
+        """Drop the cached item tree (call after any mutation)."""
+        self._meta_cache = None
 
     def authenticate(self) -> None:
         """Authenticate with reMarkable Cloud."""
-        import os
+        global _token_renewed_at
         logger.info("Authenticating with reMarkable Cloud")
 
-        # Log the config directory being used
-        config_dir = os.path.expanduser("~/.rmapi")
-        logger.info(f"Config directory: {config_dir}")
-        logger.info(f"Config exists: {os.path.exists(config_dir)}")
-        if os.path.exists(config_dir):
-            logger.info(f"Config contents: {os.listdir(config_dir)}")
+        # The shared client's token stays valid for a while; skip the
+        # renewal round-trip if it was refreshed recently
+        if _token_renewed_at is not None and time.monotonic() - _token_renewed_at < _TOKEN_TTL:
+            logger.info("Reusing recently renewed token")
+            self.is_authenticated = True
+            return
+
+        # Config-dir diagnostics: syscalls on the auth hot path that also
+        # leak config contents into logs, so only run them under DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            config_dir = os.path.expanduser("~/.rmapi")
+            logger.debug("Config directory: %s", config_dir)
+            logger.debug("Config exists: %s", os.path.exists(config_dir))
+            if os.path.exists(config_dir):
+                logger.debug("Config contents: %s", os.listdir(config_dir))
 
         # Check if we already have a registered device token
         try:
             # Try to renew token (works if already registered)
             self.client.renew_token()
+            _token_renewed_at = time.monotonic()
             logger.info("Successfully authenticated using existing token")
             self.is_authenticated = True
             return
@@ -62,6 +155,7 @@ class RemarkableClient:
         try:
             self.client.register_device(clean_code)
             self.client.renew_token()
+            _token_renewed_at = time.monotonic()
             self.is_authenticated = True
             logger.info("Successfully registered and authenticated")
         except Exception as e:
@@ -84,25 +178,31 @@ class RemarkableClient:
 
         logger.info(f"Looking for folder: {folder_name}")
 
-        # Get all items
-        items = self.client.get_meta_items()
-
         # Search for existing folder
-        for item in items:
-            if isinstance(item, Folder) and item.VissibleName == folder_name:
-                logger.info(f"Found existing folder: {folder_name}")
-                return item
+        self._get_meta_items_cached()
+        folder = self._folders_by_name.get(folder_name)
+        if folder is not None:
+            logger.info(f"Found existing folder: {folder_name}")
+            return folder
 
         # Create new folder
+        from rmapy.folder import Folder
+
         logger.info(f"Creating new folder: {folder_name}")
         folder = Folder(folder_name)
         self.client.create_folder(folder)
+        self.invalidate_meta_cache()
 
-        # Refresh and get the created folder
-        items = self.client.get_meta_items()
-        for item in items:
-            if isinstance(item, Folder) and item.VissibleName == folder_name:
-                return item
+        # rmapy assigns the ID client-side, so the local object is already
+        # usable — no need to refetch the whole tree to find what we just
+        # created. Refetch only if the ID is somehow missing.
+        if getattr(folder, 'ID', None):
+            return folder
+
+        self._get_meta_items_cached()
+        folder = self._folders_by_name.get(folder_name)
+        if folder is not None:
+            return folder
 
         raise RuntimeError(f"Failed to create folder: {folder_name}")
 
@@ -129,53 +229,104 @@ class RemarkableClient:
         logger.info(f"Uploading PDF: {filename}")
 
         # Create document
+        from rmapy.document import Document
+
         doc = Document(filename)
 
         if folder:
             doc.Parent = folder.ID
 
-        # Upload the document
-        with open('/tmp/temp_upload.pdf', 'wb') as f:
-            f.write(pdf_bytes)
+        # rmapy wants a file path, so stage the bytes in a per-call temp
+        # file; a shared path would race under concurrent uploads. A 1 MB
+        # buffer keeps multi-MB PDFs from issuing hundreds of small writes.
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False, buffering=1 << 20) as f:
+            # Stream in 1 MB chunks rather than one monolithic write, so
+            # peak memory stays ~1 MB above the PDF and the OS can
+            # interleave these writes with other threads' uploads
+            shutil.copyfileobj(io.BytesIO(pdf_bytes), f, length=1 << 20)
+            tmp_path = f.name
 
-        self.client.upload(doc)
-        self.client.upload_pdf_document('/tmp/temp_upload.pdf', doc)
+        try:
+            self.client.upload(doc)
+            self.client.upload_pdf_document(tmp_path, doc)
+        finally:
+            os.unlink(tmp_path)
+
+        self.invalidate_meta_cache()
 
         logger.info(f"Successfully uploaded: {filename}")
         return doc
 
-    def get_documents_in_folder(self, folder_name: str) -> List[Document]:
+    def upload_pdfs_batch(
+        self,
+        items: List[Tuple[bytes, str]],
+        folder: Optional[Folder] = None,
+        max_workers: int = 8
+    ) -> List[Document]:
         """
-        Get all documents in a specific folder.
+        Upload several PDFs concurrently.
+
+        The authenticated client holds an HTTP session with a connection
+        pool, so parallel uploads share connections instead of paying one
+        TLS handshake and round-trip per document in series.
 
         Args:
-            folder_name: Name of the folder
+            items: (pdf_bytes, filename) pairs to upload
+            folder: Optional folder to upload to
+            max_workers: Number of concurrent uploads
 
         Returns:
-            List of Document objects
+            Uploaded Document objects, in the same order as items
         """
         if not self.is_authenticated:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
 
-        # Find folder
-        folder = None
-        items = self.client.get_meta_items()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            documents = list(executor.map(
+                lambda item: self.upload_pdf(item[0], item[1], folder),
+                items
+            ))
 
-        for item in items:
-            if isinstance(item, Folder) and item.VissibleName == folder_name:
-                folder = item
-                break
+        logger.info(f"Uploaded {len(documents)} PDFs")
+        return documents
+
+    def iter_documents_in_folder(self, folder_name: str) -> Iterator[Document]:
+        """
+        Iterate over the documents in a specific folder.
+
+        Yields straight from the cached index, so callers that stop early
+        never pay for a full list.
+
+        Args:
+            folder_name: Name of the folder
+
+        Yields:
+            Document objects
+        """
+        if not self.is_authenticated:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        # Find folder
+        self._get_meta_items_cached()
+        folder = self._folders_by_name.get(folder_name)
 
         if not folder:
             logger.warning(f"Folder not found: {folder_name}")
-            return []
+            return
 
-        # Get documents in folder
-        documents = []
-        for item in items:
-            if isinstance(item, Document) and item.Parent == folder.ID:
-                documents.append(item)
+        yield from self._docs_by_parent.get(folder.ID, [])
 
+    def get_documents_in_folder(self, folder_name: str) -> List[Document]:
+        """
+        Get all documents in a specific folder.
+
+        Args:
+            folder_name: Name of the folder
+
+        Returns:
+            List of Document objects
+        """
+        documents = list(self.iter_documents_in_folder(folder_name))
         logger.info(f"Found {len(documents)} documents in folder: {folder_name}")
         return documents
 
@@ -191,20 +342,52 @@ class RemarkableClient:
 
         logger.info(f"Deleting document: {document.VissibleName}")
         self.client.delete(document)
+        self.invalidate_meta_cache()
         logger.info(f"Successfully deleted: {document.VissibleName}")
 
-    def get_all_documents(self) -> List[Document]:
+    def delete_documents(self, documents: List[Document], max_workers: int = 8) -> None:
         """
-        Get all documents from reMarkable.
+        Delete several documents concurrently.
 
-        Returns:
-            List of all Document objects
+        Like upload_pdfs_batch, this reuses the client's connection pool
+        across workers and invalidates the metadata cache once at the end
+        instead of per deletion.
+
+        Args:
+            documents: Documents to delete
+            max_workers: Number of concurrent deletions
         """
         if not self.is_authenticated:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
 
-        items = self.client.get_meta_items()
-        documents = [item for item in items if isinstance(item, Document)]
+        logger.info(f"Deleting {len(documents)} documents")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self.client.delete, documents))
 
+        self.invalidate_meta_cache()
+        logger.info(f"Successfully deleted {len(documents)} documents")
+
+    def iter_all_documents(self) -> Iterator[Document]:
+        """
+        Iterate over all documents from reMarkable.
+
+        Yields:
+            Document objects
+        """
+        if not self.is_authenticated:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        self._get_meta_items_cached()
+        yield from self._all_docs
+
+    def get_all_documents(self) -> List[Document]:
+        """
+        Get all documents from reMarkable.
+
+        Returns:
+            List of all Document objects
+        """
+        documents = list(self.iter_all_documents())
         logger.info(f"Found {len(documents)} total documents")
         return documents